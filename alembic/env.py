@@ -14,13 +14,13 @@ if root_path not in sys.path:
 
 # Now we can import our app modules
 from app.models import Base
-from app.config import DATABASE_URL
+from app.config import settings
 
 # this is the Alembic Config object
 config = context.config
 
 # override sqlalchemy.url from alembic.ini
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
@@ -0,0 +1,56 @@
+"""store appointment status as a native enum
+
+Revision ID: 1d6f3b8e2c97
+Revises: e94b7c1f0a62
+Create Date: 2026-10-15 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d6f3b8e2c97'
+down_revision = 'e94b7c1f0a62'
+branch_labels = None
+depends_on = None
+
+appointment_status = sa.Enum('SCHEDULED', 'COMPLETED', 'CANCELLED', 'PENDING', name='appointment_status')
+
+NO_OVERLAP_CONSTRAINT = (
+    "ALTER TABLE appointments ADD CONSTRAINT ex_appt_doctor_no_overlap "
+    "EXCLUDE USING gist ("
+    "doctor_id WITH =, "
+    "tsrange(appointment_date + appointment_start_time, appointment_date + appointment_end_time) WITH &&"
+    ") WHERE (status <> 'CANCELLED')"
+)
+
+
+def upgrade():
+    # The overlap constraint's predicate compares status to text; rebuild it
+    # against the new type rather than let the column change carry the cast over.
+    op.drop_constraint('ex_appt_doctor_no_overlap', 'appointments')
+    appointment_status.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'appointments',
+        'status',
+        type_=appointment_status,
+        existing_type=sa.String(length=20),
+        existing_nullable=False,
+        postgresql_using='status::appointment_status',
+    )
+    op.execute(NO_OVERLAP_CONSTRAINT)
+
+
+def downgrade():
+    op.drop_constraint('ex_appt_doctor_no_overlap', 'appointments')
+    op.alter_column(
+        'appointments',
+        'status',
+        type_=sa.String(length=20),
+        existing_type=appointment_status,
+        existing_nullable=False,
+        postgresql_using='status::text',
+    )
+    appointment_status.drop(op.get_bind(), checkfirst=True)
+    op.execute(NO_OVERLAP_CONSTRAINT)
@@ -0,0 +1,47 @@
+"""initial appointments table
+
+Revision ID: 3f1c2a9d7e40
+Revises: 
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7e40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases bootstrapped through Base.metadata.create_all() already have
+    # the table; only create it on a fresh database.
+    if sa.inspect(op.get_bind()).has_table("appointments"):
+        return
+
+    op.create_table(
+        'appointments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('appointment_id', sa.String(length=50), nullable=False),
+        sa.Column('doctor_id', sa.String(length=50), nullable=False),
+        sa.Column('patient_id', sa.String(length=50), nullable=False),
+        sa.Column('facility_id', sa.String(length=50), nullable=False),
+        sa.Column('doctor_name', sa.String(length=100), nullable=False),
+        sa.Column('patient_name', sa.String(length=100), nullable=False),
+        sa.Column('appointment_date', sa.Date(), nullable=False),
+        sa.Column('appointment_start_time', sa.Time(), nullable=False),
+        sa.Column('appointment_end_time', sa.Time(), nullable=False),
+        sa.Column('purpose_of_visit', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('appointment_id')
+    )
+
+
+def downgrade():
+    op.drop_table('appointments')
@@ -0,0 +1,28 @@
+"""add indexes for doctor, patient and facility filters
+
+Revision ID: 5e2d8f4a9c13
+Revises: c7a91e3b5d08
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2d8f4a9c13'
+down_revision = 'c7a91e3b5d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_appt_doctor_date_status', 'appointments', ['doctor_id', 'appointment_date', 'status'], unique=False)
+    op.create_index('ix_appt_patient_status', 'appointments', ['patient_id', 'status'], unique=False)
+    op.create_index('ix_appt_facility', 'appointments', ['facility_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_appt_facility', table_name='appointments')
+    op.drop_index('ix_appt_patient_status', table_name='appointments')
+    op.drop_index('ix_appt_doctor_date_status', table_name='appointments')
@@ -0,0 +1,38 @@
+"""generate appointment_id from appointment_seq
+
+Revision ID: 8b4e0d6c21a5
+Revises: 3f1c2a9d7e40
+Create Date: 2026-10-15 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e0d6c21a5'
+down_revision = '3f1c2a9d7e40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE SEQUENCE IF NOT EXISTS appointment_seq")
+    # Continue numbering after the highest APTnnnn already handed out
+    op.execute(
+        "SELECT setval('appointment_seq', "
+        "COALESCE((SELECT MAX(substring(appointment_id FROM 4)::integer) FROM appointments), 0) + 1, "
+        "false)"
+    )
+    op.alter_column(
+        'appointments',
+        'appointment_id',
+        server_default=sa.text(
+            "('APT' || regexp_replace('000' || nextval('appointment_seq')::text, '^0+(?=\\d{4})', ''))"
+        ),
+    )
+
+
+def downgrade():
+    op.alter_column('appointments', 'appointment_id', server_default=None)
+    op.execute("DROP SEQUENCE IF EXISTS appointment_seq")
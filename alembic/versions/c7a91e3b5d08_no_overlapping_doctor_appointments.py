@@ -0,0 +1,68 @@
+"""exclude overlapping appointments per doctor
+
+Revision ID: c7a91e3b5d08
+Revises: 8b4e0d6c21a5
+Create Date: 2026-10-15 09:20:00.000000
+
+The constraint cannot be added while a doctor already has overlapping
+non-cancelled appointments (the old check-then-insert create was racy and
+un-cancelling was never checked). The upgrade lists any such pairs and
+stops; resolve them first, e.g. by cancelling the later booking of each pair:
+
+    UPDATE appointments SET status = 'CANCELLED'
+    WHERE appointment_id IN ('<later appointment_id>', ...);
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a91e3b5d08'
+down_revision = '8b4e0d6c21a5'
+branch_labels = None
+depends_on = None
+
+
+OVERLAPPING_APPOINTMENTS = sa.text(
+    "SELECT a.doctor_id, a.appointment_date, a.appointment_id, b.appointment_id "
+    "FROM appointments a JOIN appointments b "
+    "ON b.doctor_id = a.doctor_id AND b.appointment_date = a.appointment_date AND b.id > a.id "
+    "AND b.appointment_start_time < a.appointment_end_time "
+    "AND b.appointment_end_time > a.appointment_start_time "
+    "WHERE a.status <> 'CANCELLED' AND b.status <> 'CANCELLED' "
+    "ORDER BY a.doctor_id, a.appointment_date, a.id, b.id"
+)
+
+
+def check_no_overlaps():
+    # Offline (--sql) runs have no data to inspect
+    if context.is_offline_mode():
+        return
+    overlaps = op.get_bind().execute(OVERLAPPING_APPOINTMENTS).all()
+    if overlaps:
+        pairs = "\n".join(
+            f"  doctor {doctor_id} on {day}: {first} overlaps {second}"
+            for doctor_id, day, first, second in overlaps
+        )
+        raise RuntimeError(
+            "Cannot add ex_appt_doctor_no_overlap: these non-cancelled appointments overlap.\n"
+            f"{pairs}\n"
+            "Cancel or reschedule one appointment of each pair, then rerun the upgrade."
+        )
+
+
+def upgrade():
+    check_no_overlaps()
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT ex_appt_doctor_no_overlap "
+        "EXCLUDE USING gist ("
+        "doctor_id WITH =, "
+        "tsrange(appointment_date + appointment_start_time, appointment_date + appointment_end_time) WITH &&"
+        ") WHERE (status <> 'CANCELLED')"
+    )
+
+
+def downgrade():
+    op.drop_constraint('ex_appt_doctor_no_overlap', 'appointments')
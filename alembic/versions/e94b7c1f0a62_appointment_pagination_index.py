@@ -0,0 +1,24 @@
+"""add index for paginating appointments by date
+
+Revision ID: e94b7c1f0a62
+Revises: 5e2d8f4a9c13
+Create Date: 2026-10-15 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e94b7c1f0a62'
+down_revision = '5e2d8f4a9c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_appt_date_id', 'appointments', ['appointment_date', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_appt_date_id', table_name='appointments')
@@ -1,176 +1,407 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, Integer, bindparam, func, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from datetime import date, time
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+from cachetools import TTLCache
 from fastapi import HTTPException
-from app.models.appointments import Appointment, AppointmentStatus
+from app.models.appointments import Appointment, AppointmentStatus, NO_OVERLAP_CONSTRAINT
 from app.schemas.appointments import TimeSlot, AppointmentRequest
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_all_appointments(db: Session) -> List[Appointment]:
-    """Get all appointments"""
+# Bookable hours for get_available_time_slots: [start, end)
+WORKING_DAY_START_HOUR = 9
+WORKING_DAY_END_HOUR = 17
+
+# One-hour slots across working hours, built once and shared by every
+# response (TimeSlot instances are never modified after creation)
+_WORKING_HOURS = tuple(
+    TimeSlot(
+        start_time=time(hour=h),
+        end_time=time(hour=h+1)
+    ) for h in range(WORKING_DAY_START_HOUR, WORKING_DAY_END_HOUR)
+)
+
+# Status counts are cached briefly so dashboards polling the /count endpoints
+# cost one grouped query per TTL instead of one COUNT(*) per endpoint.
+# Only touched from the event loop thread, so no locking is needed.
+STATUS_COUNTS_TTL_SECONDS = 5
+_status_counts_cache = TTLCache(maxsize=1, ttl=STATUS_COUNTS_TTL_SECONDS)
+_doctor_status_counts_cache = TTLCache(maxsize=1024, ttl=STATUS_COUNTS_TTL_SECONDS)
+_patient_status_counts_cache = TTLCache(maxsize=1024, ttl=STATUS_COUNTS_TTL_SECONDS)
+
+# Bumped on every invalidation. A read that started before a write committed
+# must not store its result after the write has cleared the caches.
+_status_counts_generation = 0
+
+def _build_status_count_stmt(*criteria):
+    return (
+        select(Appointment.status, func.count())
+        .where(*criteria)
+        .group_by(Appointment.status)
+    )
+
+# Built once at import; each call only binds its parameters
+_COUNT_BY_STATUS = _build_status_count_stmt()
+_COUNT_BY_STATUS_FOR_DOCTOR = _build_status_count_stmt(Appointment.doctor_id == bindparam("doctor_id"))
+_COUNT_BY_STATUS_FOR_PATIENT = _build_status_count_stmt(Appointment.patient_id == bindparam("patient_id"))
+
+async def _cached_status_counts(
+    cache: TTLCache,
+    key: str,
+    db: AsyncSession,
+    stmt,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[AppointmentStatus, int]:
+    counts = cache.get(key)
+    if counts is None:
+        generation = _status_counts_generation
+        counts = dict((await db.execute(stmt, params)).all())
+        if generation == _status_counts_generation:
+            cache[key] = counts
+    return counts
+
+# Columns returned by the list endpoints (see AppointmentListItem). Selecting
+# them directly skips hydrating full ORM objects for every row. id is only
+# used as the keyset tie-breaker for pagination.
+_LIST_COLUMNS = (
+    Appointment.id,
+    Appointment.appointment_id,
+    Appointment.doctor_id,
+    Appointment.patient_id,
+    Appointment.appointment_date,
+    Appointment.appointment_start_time,
+    Appointment.appointment_end_time,
+    Appointment.status,
+)
+
+def _build_create_appointment_stmt():
+    """INSERT ... SELECT ... WHERE NOT EXISTS (overlapping appointment) RETURNING *
+
+    Checks for a conflict and inserts in one round trip; no row comes back
+    when the doctor is already booked. appointment_id (APT0001, APT0002, ...)
+    and created_at are filled in by the database defaults.
+    """
+    columns = Appointment.__table__.c
+    params = {
+        name: bindparam(name, type_=columns[name].type)
+        for name in (
+            "doctor_id",
+            "patient_id",
+            "facility_id",
+            "doctor_name",
+            "patient_name",
+            "appointment_date",
+            "appointment_start_time",
+            "appointment_end_time",
+            "purpose_of_visit",
+            "description",
+            "status",
+        )
+    }
+    conflicting = select(Appointment.id).where(
+        Appointment.doctor_id == params["doctor_id"],
+        Appointment.appointment_date == params["appointment_date"],
+        Appointment.status != AppointmentStatus.CANCELLED,
+        Appointment.appointment_start_time < params["appointment_end_time"],
+        Appointment.appointment_end_time > params["appointment_start_time"]
+    ).exists()
+    new_row = select(*params.values()).where(~conflicting)
+    insert_stmt = insert(Appointment).from_select(list(params), new_row).returning(Appointment)
+    return select(Appointment).from_statement(insert_stmt)
+
+# Built once at import; each create only binds its values
+_CREATE_APPOINTMENT = _build_create_appointment_stmt()
+
+_BY_APPOINTMENT_ID = select(Appointment).where(Appointment.appointment_id == bindparam("appointment_id"))
+_BY_APPOINTMENT_IDS = select(Appointment).where(
+    Appointment.appointment_id.in_(bindparam("appointment_ids", expanding=True))
+)
+
+# Upper bound on the IDs accepted by one batch lookup
+MAX_BATCH_IDS = 100
+
+# List endpoints are paginated newest first on (appointment_date, id)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def _encode_cursor(row) -> str:
+    return f"{row.appointment_date.isoformat()}_{row.id}"
+
+def _decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        cursor_date, cursor_id = cursor.split("_")
+        return date.fromisoformat(cursor_date), int(cursor_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _build_list_stmt(filter_column=None, after_cursor: bool = False):
+    stmt = select(*_LIST_COLUMNS)
+    if filter_column is not None:
+        stmt = stmt.where(filter_column == bindparam("filter_value"))
+    if after_cursor:
+        stmt = stmt.where(
+            tuple_(Appointment.appointment_date, Appointment.id)
+            < tuple_(bindparam("cursor_date", type_=Date), bindparam("cursor_id", type_=Integer))
+        )
+    return (
+        stmt.order_by(Appointment.appointment_date.desc(), Appointment.id.desc())
+        .limit(bindparam("limit", type_=Integer))
+    )
+
+# (first page, following pages) statement for each list filter, built once at import
+_LIST_STMTS = {
+    name: (_build_list_stmt(column), _build_list_stmt(column, after_cursor=True))
+    for name, column in (
+        ("all", None),
+        ("doctor", Appointment.doctor_id),
+        ("patient", Appointment.patient_id),
+        ("facility", Appointment.facility_id),
+    )
+}
+
+async def _list_appointments(
+    db: AsyncSession,
+    filter_name: str,
+    filter_value: Optional[str],
+    limit: int,
+    cursor: Optional[str]
+) -> Dict[str, Any]:
+    first_page, next_page = _LIST_STMTS[filter_name]
+    # Fetch one extra row to know whether another page follows
+    params = {"filter_value": filter_value, "limit": limit + 1}
+    if cursor:
+        stmt = next_page
+        params["cursor_date"], params["cursor_id"] = _decode_cursor(cursor)
+    else:
+        stmt = first_page
+    rows = (await db.execute(stmt, params)).all()
+
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"items": rows[:limit], "next_cursor": next_cursor}
+
+def _invalidate_status_counts() -> None:
+    global _status_counts_generation
+    _status_counts_generation += 1
+    _status_counts_cache.clear()
+    _doctor_status_counts_cache.clear()
+    _patient_status_counts_cache.clear()
+
+# Free slots per (doctor_id, date). Availability only changes when that
+# doctor's bookings for the date change, so the entry is dropped on every
+# create or status update for it; the TTL bounds staleness across workers.
+SLOTS_CACHE_TTL_SECONDS = 30
+_slots_cache = TTLCache(maxsize=10_000, ttl=SLOTS_CACHE_TTL_SECONDS)
+
+# Token of the latest read in progress per key. Invalidation drops it, so a
+# read that started before a booking changed does not store its stale result.
+_slots_fills: Dict[Tuple[str, str], object] = {}
+
+def _invalidate_slots(doctor_id: str, appointment_date: date) -> None:
+    cache_key = (doctor_id, appointment_date.isoformat())
+    _slots_cache.pop(cache_key, None)
+    _slots_fills.pop(cache_key, None)
+
+DOCTOR_CONFLICT_DETAIL = "Doctor already has an appointment scheduled during this time"
+
+def _is_doctor_overlap(error: IntegrityError) -> bool:
+    """Whether the write was rejected by ex_appt_doctor_no_overlap"""
+    # asyncpg raises the driver error (with constraint_name) as the cause of the DBAPI error
+    return getattr(error.orig.__cause__, "constraint_name", None) == NO_OVERLAP_CONSTRAINT
+
+async def get_all_appointments(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get a page of all appointments"""
     try:
-        return db.query(Appointment).all()
+        return await _list_appointments(db, "all", None, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all appointments: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def get_appointment_by_id(db: Session, appointment_id: str) -> Appointment:
+async def get_appointment_by_id(db: AsyncSession, appointment_id: str) -> Appointment:
     """Get appointment by ID"""
-    appointment = db.query(Appointment).filter(Appointment.appointment_id == appointment_id).first()
+    appointment = (await db.scalars(
+        _BY_APPOINTMENT_ID, {"appointment_id": appointment_id}
+    )).first()
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return appointment
 
-def create_appointment(db: Session, appointment: AppointmentRequest) -> Appointment:
+async def get_appointments_by_ids(db: AsyncSession, appointment_ids: List[str]) -> List[Appointment]:
+    """Get the appointments for several IDs in a single query; unknown IDs are skipped"""
+    unique_ids = list(dict.fromkeys(appointment_ids))
+    if len(unique_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_IDS} appointment IDs can be requested at once"
+        )
+    return (await db.scalars(
+        _BY_APPOINTMENT_IDS, {"appointment_ids": unique_ids}
+    )).all()
+
+async def create_appointment(db: AsyncSession, appointment: AppointmentRequest) -> Appointment:
     """Create a new appointment"""
     try:
-        # Get the last appointment and extract the numeric part of the ID
-        last_appointment = db.query(Appointment).order_by(Appointment.appointment_id.desc()).first()
-        if last_appointment:
-            last_id = int(last_appointment.appointment_id[3:])  # Extract number after 'APT'
-            next_id = last_id + 1
-        else:
-            next_id = 1
-            
-        appointment_id = f"APT{str(next_id).zfill(4)}"  # Format: APT0001, APT0002, etc.
-
-        # Check for conflicting appointments
-        existing_appointment = db.query(Appointment).filter(
-            and_(
-                Appointment.doctor_id == appointment.doctor_id,
-                Appointment.appointment_date == appointment.appointment_date,
-                Appointment.status != AppointmentStatus.CANCELLED,
-                and_(
-                    Appointment.appointment_start_time < appointment.appointment_end_time,
-                    Appointment.appointment_end_time > appointment.appointment_start_time
-                )
-            )
-        ).first()
-
-        if existing_appointment:
-            raise HTTPException(
-                status_code=400,
-                detail="Doctor already has an appointment scheduled during this time"
-            )
-
-        db_appointment = Appointment(
-            appointment_id=appointment_id,
-            doctor_id=appointment.doctor_id,
-            patient_id=appointment.patient_id,
-            facility_id=appointment.facility_id,
-            doctor_name=appointment.doctor_name,
-            patient_name=appointment.patient_name,
-            appointment_date=appointment.appointment_date,
-            appointment_start_time=appointment.appointment_start_time,
-            appointment_end_time=appointment.appointment_end_time,
-            purpose_of_visit=appointment.purpose_of_visit,
-            description=appointment.description,
-            status=AppointmentStatus.SCHEDULED
-        )
-        
-        db.add(db_appointment)
-        db.commit()
-        db.refresh(db_appointment)
+        values = {**appointment.model_dump(), "status": AppointmentStatus.SCHEDULED}
+        db_appointment = (await db.scalars(_CREATE_APPOINTMENT, values)).first()
+        if db_appointment is None:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=DOCTOR_CONFLICT_DETAIL)
+
+        await db.commit()
+        _invalidate_status_counts()
+        _invalidate_slots(appointment.doctor_id, appointment.appointment_date)
         return db_appointment
 
     except HTTPException as he:
         raise he
+    except IntegrityError as e:
+        await db.rollback()
+        # A concurrent create won the race; rejected by ex_appt_doctor_no_overlap
+        if _is_doctor_overlap(e):
+            raise HTTPException(status_code=400, detail=DOCTOR_CONFLICT_DETAIL)
+        logger.error(f"Error creating appointment: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating appointment: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-def update_appointment_status(db: Session, appointment_id: str, new_status: AppointmentStatus) -> Appointment:
+async def update_appointment_status(db: AsyncSession, appointment_id: str, new_status: AppointmentStatus) -> Appointment:
     """Update appointment status"""
     try:
-        appointment = get_appointment_by_id(db, appointment_id)
+        appointment = await get_appointment_by_id(db, appointment_id)
         appointment.status = new_status
-        db.commit()
-        db.refresh(appointment)
+        await db.commit()
+        _invalidate_status_counts()
+        _invalidate_slots(appointment.doctor_id, appointment.appointment_date)
+        await db.refresh(appointment)
         return appointment
+    except IntegrityError as e:
+        await db.rollback()
+        # Un-cancelling into a slot the doctor has since rebooked
+        if _is_doctor_overlap(e):
+            raise HTTPException(status_code=400, detail=DOCTOR_CONFLICT_DETAIL)
+        logger.error(f"Error updating appointment status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error updating appointment status")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error updating appointment status: {str(e)}")
         raise HTTPException(status_code=500, detail="Error updating appointment status")
 
-def get_appointments_by_patient_id(db: Session, patient_id: str) -> List[Appointment]:
-    """Get all appointments for a specific patient"""
+async def get_appointments_by_patient_id(
+    db: AsyncSession,
+    patient_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get a page of appointments for a specific patient"""
     try:
-        return db.query(Appointment).filter(Appointment.patient_id == patient_id).all()
+        return await _list_appointments(db, "patient", patient_id, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching patient appointments: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def get_appointments_by_doctor_id(db: Session, doctor_id: str) -> List[Appointment]:
-    """Get all appointments for a specific doctor"""
+async def get_appointments_by_doctor_id(
+    db: AsyncSession,
+    doctor_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get a page of appointments for a specific doctor"""
     try:
-        return db.query(Appointment).filter(Appointment.doctor_id == doctor_id).all()
+        return await _list_appointments(db, "doctor", doctor_id, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching doctor appointments: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def get_appointments_by_facility_id(db: Session, facility_id: str) -> List[Appointment]:
-    return db.query(Appointment).filter(Appointment.facility_id == facility_id).all()
+async def get_appointments_by_facility_id(
+    db: AsyncSession,
+    facility_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    return await _list_appointments(db, "facility", facility_id, limit, cursor)
 
-def get_appointment_count_by_doctor_and_status(
-    db: Session,
+async def get_appointment_count_by_doctor_and_status(
+    db: AsyncSession,
     doctor_id: str,
     status: AppointmentStatus
 ) -> int:
-    return db.query(Appointment).filter(
-        Appointment.doctor_id == doctor_id,
-        Appointment.status == status
-    ).count()
+    counts = await _cached_status_counts(
+        _doctor_status_counts_cache, doctor_id, db,
+        _COUNT_BY_STATUS_FOR_DOCTOR, {"doctor_id": doctor_id}
+    )
+    return counts.get(status, 0)
 
-def get_appointment_count_by_patient_and_status(
-    db: Session,
+async def get_appointment_count_by_patient_and_status(
+    db: AsyncSession,
     patient_id: str,
     status: AppointmentStatus
 ) -> int:
-    return db.query(Appointment).filter(
-        Appointment.patient_id == patient_id,
-        Appointment.status == status
-    ).count()
+    counts = await _cached_status_counts(
+        _patient_status_counts_cache, patient_id, db,
+        _COUNT_BY_STATUS_FOR_PATIENT, {"patient_id": patient_id}
+    )
+    return counts.get(status, 0)
+
+def _build_free_hours_stmt():
+    # One-hour slots across working hours (9 AM to 5 PM); the database
+    # returns only the hours that no non-cancelled appointment overlaps
+    hour = func.generate_series(WORKING_DAY_START_HOUR, WORKING_DAY_END_HOUR - 1).column_valued("slot_hour")
+    slot_start = func.make_time(hour, 0, 0)
+    slot_end = func.make_time(hour + 1, 0, 0)
+    booked = select(Appointment.id).where(
+        Appointment.doctor_id == bindparam("doctor_id"),
+        Appointment.appointment_date == bindparam("appointment_date"),
+        Appointment.status != AppointmentStatus.CANCELLED,
+        Appointment.appointment_start_time < slot_end,
+        Appointment.appointment_end_time > slot_start
+    ).exists()
+    return select(hour).where(~booked).order_by(hour)
+
+_FREE_HOURS = _build_free_hours_stmt()
 
-def get_available_time_slots(
-    db: Session,
+async def _free_slots_in_database(db: AsyncSession, doctor_id: str, date: date) -> Tuple[TimeSlot, ...]:
+    free_hours = (await db.scalars(
+        _FREE_HOURS, {"doctor_id": doctor_id, "appointment_date": date}
+    )).all()
+    return tuple(_WORKING_HOURS[h - WORKING_DAY_START_HOUR] for h in free_hours)
+
+async def get_available_time_slots(
+    db: AsyncSession,
     doctor_id: str,
     date: date
 ) -> List[TimeSlot]:
-    # Get all appointments for the doctor on the given date
-    booked_slots = db.query(
-        Appointment.appointment_start_time,
-        Appointment.appointment_end_time
-    ).filter(
-        Appointment.doctor_id == doctor_id,
-        Appointment.appointment_date == date,
-        Appointment.status != AppointmentStatus.CANCELLED
-    ).all()
-    
-    # Define working hours (e.g., 9 AM to 5 PM)
-    working_hours = [
-        TimeSlot(
-            start_time=time(hour=i),
-            end_time=time(hour=i+1)
-        ) for i in range(9, 17)
-    ]
-    
-    # Remove booked slots
-    available_slots = []
-    for slot in working_hours:
-        is_available = True
-        for booked in booked_slots:
-            if (slot.start_time >= booked.appointment_start_time and 
-                slot.start_time < booked.appointment_end_time):
-                is_available = False
-                break
-        if is_available:
-            available_slots.append(slot)
-    
-    return available_slots
-
-def get_appointments_count_by_status(db: Session, status: AppointmentStatus) -> int:
-    return db.query(Appointment).filter(Appointment.status == status).count()
+    cache_key = (doctor_id, date.isoformat())
+    cached_slots = _slots_cache.get(cache_key)
+    if cached_slots is not None:
+        return list(cached_slots)
+
+    fill = _slots_fills[cache_key] = object()
+    try:
+        available_slots = await _free_slots_in_database(db, doctor_id, date)
+        if _slots_fills.get(cache_key) is fill:
+            _slots_cache[cache_key] = available_slots
+    finally:
+        if _slots_fills.get(cache_key) is fill:
+            del _slots_fills[cache_key]
+    return list(available_slots)
+
+async def get_counts_by_status_grouped(db: AsyncSession) -> Dict[AppointmentStatus, int]:
+    """Get the number of appointments in every status with a single grouped query"""
+    return await _cached_status_counts(_status_counts_cache, "all", db, _COUNT_BY_STATUS)
+
+async def get_appointments_count_by_status(db: AsyncSession, status: AppointmentStatus) -> int:
+    return (await get_counts_by_status_grouped(db)).get(status, 0)
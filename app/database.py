@@ -1,39 +1,60 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import os
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.config import settings
 from app.models.base import Base
 import app.models.appointments  # Import models this way to avoid circular imports
 
-# Add SSL mode for Render if not present
-database_url = settings.DATABASE_URL
-if "sslmode" not in database_url:
-    database_url += "?sslmode=require"
+# Use the asyncpg driver. asyncpg takes the SSL mode as a connect argument rather
+# than a sslmode URL parameter; Render requires SSL, so default to "require".
+database_url = make_url(settings.DATABASE_URL)
+ssl_mode = database_url.query.get("sslmode", "require")
+database_url = database_url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
 
 # Create engine with production settings
-engine = create_engine(
+engine = create_async_engine(
     database_url,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True
+    connect_args={"ssl": ssl_mode},
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_USE_LIFO
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def init_db():
+# Migration scripts, used to stamp databases created by init_db()
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+def _create_schema(connection):
+    # A fresh database gets the current schema from create_all(), which is
+    # what the migrations build up to, so record it as being at the Alembic
+    # head; otherwise a later `alembic upgrade head` would try to add the
+    # sequence default, constraint and indexes a second time. Existing tables
+    # are left for the migrations to bring up to date.
+    fresh = not inspect(connection).has_table(app.models.appointments.Appointment.__tablename__)
+    Base.metadata.create_all(connection)
+    if fresh:
+        MigrationContext.configure(connection).stamp(ScriptDirectory(ALEMBIC_DIR), "head")
+
+async def init_db():
     try:
         print("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_schema)
         print("Database tables created successfully!")
     except Exception as e:
         print(f"Error creating tables: {e}")
 
 if __name__ == "__main__":
-    init_db()
+    asyncio.run(init_db())
@@ -1,13 +1,25 @@
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from app.database import engine, Base
+from app.config import settings
+from app.database import init_db
 from app.routers import appointments
 from app.auth_utils import get_current_user, User
 
+# Create tables only when explicitly enabled (e.g. local development);
+# deployments run Alembic migrations instead
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.INIT_DB_ON_STARTUP:
+        await init_db()
+    yield
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Appointment Microservice",
     description="Handles appointment management in the healthcare system",
     version="1.0.0",
@@ -36,8 +48,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Compress larger responses (appointment lists are repetitive JSON)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Include routers
 app.include_router(appointments.router)
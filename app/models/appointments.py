@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Text
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Text, Sequence, Index, DDL, event, text
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.sql import func
 from app.models.base import Base
 from enum import Enum as PyEnum
@@ -9,11 +11,24 @@ class AppointmentStatus(str, PyEnum):
     CANCELLED = "CANCELLED"
     PENDING = "PENDING"
 
+# Backs the APT0001, APT0002, ... appointment IDs. Attached to the metadata so
+# create_all() creates it before the appointments table that uses it.
+appointment_seq = Sequence("appointment_seq", metadata=Base.metadata)
+
+# Zero-pad to at least 4 digits without truncating once the counter passes 9999
+# (a plain lpad(..., 4, '0') would turn 10000 into APT1000).
+APPOINTMENT_ID_DEFAULT = text(
+    "('APT' || regexp_replace('000' || nextval('appointment_seq')::text, '^0+(?=\\d{4})', ''))"
+)
+
+# Name of the exclusion constraint below; crud matches IntegrityErrors against it
+NO_OVERLAP_CONSTRAINT = "ex_appt_doctor_no_overlap"
+
 class Appointment(Base):
     __tablename__ = "appointments"
 
     id = Column(Integer, primary_key=True)
-    appointment_id = Column(String(50), unique=True, nullable=False)
+    appointment_id = Column(String(50), unique=True, nullable=False, server_default=APPOINTMENT_ID_DEFAULT)
     doctor_id = Column(String(50),  nullable=False)
     patient_id = Column(String(50), nullable=False)
     facility_id = Column(String(50), nullable=False)
@@ -24,6 +39,30 @@ class Appointment(Base):
     appointment_end_time = Column(Time, nullable=False)
     purpose_of_visit = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(String(20), nullable=False, default=AppointmentStatus.PENDING)
+    status = Column(SQLEnum(AppointmentStatus, name="appointment_status"), nullable=False, default=AppointmentStatus.PENDING)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
+    # Two non-cancelled appointments for the same doctor may never overlap.
+    # Enforced by the database so concurrent creates cannot both succeed.
+    __table_args__ = (
+        ExcludeConstraint(
+            (doctor_id, "="),
+            (func.tsrange(appointment_date + appointment_start_time, appointment_date + appointment_end_time), "&&"),
+            name=NO_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status <> 'CANCELLED'"),
+        ),
+        # Cover the doctor/patient/facility filters used by the list, count and slot queries
+        Index("ix_appt_doctor_date_status", "doctor_id", "appointment_date", "status"),
+        Index("ix_appt_patient_status", "patient_id", "status"),
+        Index("ix_appt_facility", "facility_id"),
+        # Newest-first keyset pagination of the unfiltered list
+        Index("ix_appt_date_id", "appointment_date", "id"),
+    )
+
+# gist needs btree_gist for the plain equality on doctor_id
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
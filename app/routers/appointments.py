@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional
 from datetime import date
 from app.database import get_db
 from app.models.appointments import AppointmentStatus
 from app.schemas.appointments import (
     AppointmentRequest,
     AppointmentResponse,
+    AppointmentDetail,
+    AppointmentPage,
     AppointmentStatusUpdateRequest,
     TimeSlot
 )
 from app.crud import (
     get_all_appointments,
     get_appointment_by_id,
+    get_appointments_by_ids,
     create_appointment,
     update_appointment_status,
     get_appointments_by_patient_id,
@@ -21,20 +24,24 @@ from app.crud import (
     get_appointments_count_by_status,
     get_appointment_count_by_doctor_and_status,
     get_appointment_count_by_patient_and_status,
-    get_available_time_slots
+    get_available_time_slots,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE
 )
 from app.auth_utils import get_current_user, get_admin_user, get_doctor_user, get_patient_user, get_staff_user, User
 
 router = APIRouter(prefix="/api/appointments", tags=["Appointments"])
 
 # Basic CRUD operations
-@router.get("/", operation_id="get_all_appointments")
-def get_appointments(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=AppointmentPage, operation_id="get_all_appointments")
+async def get_appointments(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all appointments"""
-    return get_all_appointments(db)
+    """Get all appointments, newest first, one page at a time"""
+    return await get_all_appointments(db, limit, cursor)
 
 @router.post(
     "/", 
@@ -46,7 +53,7 @@ def get_appointments(
 )
 async def create_new_appointment(
     appointment: AppointmentRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF"])
 ):
     """
@@ -62,35 +69,46 @@ async def create_new_appointment(
     - **purpose_of_visit**: Purpose of the visit
     - **description**: Additional description (optional)
     """
-    return create_appointment(db, appointment)
+    return await create_appointment(db, appointment)
 
-@router.get("/id/{appointment_id}", operation_id="get_appointment_by_id")
-def get_appointment(
+@router.get("/id/{appointment_id}", response_model=AppointmentDetail, operation_id="get_appointment_by_id")
+async def get_appointment(
     appointment_id: str, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get appointment by ID"""
-    return get_appointment_by_id(db, appointment_id)
+    return await get_appointment_by_id(db, appointment_id)
+
+@router.get("/batch", response_model=List[AppointmentDetail], operation_id="get_appointments_by_ids")
+async def get_appointments_batch(
+    ids: List[str] = Query(..., description="Appointment IDs, e.g. ?ids=APT0001&ids=APT0002"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF"])
+):
+    """Get several appointments by ID in one request"""
+    return await get_appointments_by_ids(db, ids)
 
 @router.put("/id/{appointment_id}/status", response_model=AppointmentResponse, operation_id="update_appointment_status")
-def update_status(
+async def update_status(
     appointment_id: str, 
     status_update: AppointmentStatusUpdateRequest, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF"])
 ):
     """
     Update appointment status
     - **status**: New status for the appointment (SCHEDULED, COMPLETED, CANCELLED, or PENDING)
     """
-    return update_appointment_status(db, appointment_id, status_update.status)
+    return await update_appointment_status(db, appointment_id, status_update.status)
 
 # Patient and doctor endpoints
-@router.get("/patient/{patient_id}", operation_id="get_patient_appointments")
-def get_patient_appointments(
+@router.get("/patient/{patient_id}", response_model=AppointmentPage, operation_id="get_patient_appointments")
+async def get_patient_appointments(
     patient_id: str, 
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF", "PATIENT"])
 ):
     """Get all appointments for a specific patient"""
@@ -100,12 +118,14 @@ def get_patient_appointments(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Patients can only view their own appointments"
         )
-    return get_appointments_by_patient_id(db, patient_id)
+    return await get_appointments_by_patient_id(db, patient_id, limit, cursor)
 
-@router.get("/doctor/{doctor_id}", operation_id="get_doctor_appointments")
-def get_doctor_appointments(
+@router.get("/doctor/{doctor_id}", response_model=AppointmentPage, operation_id="get_doctor_appointments")
+async def get_doctor_appointments(
     doctor_id: str, 
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF"])
 ):
     """Get all appointments for a specific doctor"""
@@ -115,57 +135,59 @@ def get_doctor_appointments(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Doctors can only view their own appointments"
         )
-    return get_appointments_by_doctor_id(db, doctor_id)
+    return await get_appointments_by_doctor_id(db, doctor_id, limit, cursor)
 
 # Status count endpoints
-@router.get("/count/scheduled", operation_id="get_scheduled_appointments_count")
-def get_scheduled_appointments_count(
-    db: Session = Depends(get_db),
+@router.get("/count/scheduled", response_model=int, operation_id="get_scheduled_appointments_count")
+async def get_scheduled_appointments_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "STAFF"])
 ):
     """Get count of scheduled appointments"""
-    return get_appointments_count_by_status(db, AppointmentStatus.SCHEDULED)
+    return await get_appointments_count_by_status(db, AppointmentStatus.SCHEDULED)
 
-@router.get("/count/pending", operation_id="get_pending_appointments_count")
-def get_pending_appointments_count(
-    db: Session = Depends(get_db),
+@router.get("/count/pending", response_model=int, operation_id="get_pending_appointments_count")
+async def get_pending_appointments_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "STAFF"])
 ):
     """Get count of pending appointments"""
-    return get_appointments_count_by_status(db, AppointmentStatus.PENDING)
+    return await get_appointments_count_by_status(db, AppointmentStatus.PENDING)
 
-@router.get("/count/cancelled", operation_id="get_cancelled_appointments_count")
-def get_cancelled_appointments_count(
-    db: Session = Depends(get_db),
+@router.get("/count/cancelled", response_model=int, operation_id="get_cancelled_appointments_count")
+async def get_cancelled_appointments_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "STAFF"])
 ):
     """Get count of cancelled appointments"""
-    return get_appointments_count_by_status(db, AppointmentStatus.CANCELLED)
+    return await get_appointments_count_by_status(db, AppointmentStatus.CANCELLED)
 
-@router.get("/count/completed", operation_id="get_completed_appointments_count")
-def get_completed_appointments_count(
-    db: Session = Depends(get_db),
+@router.get("/count/completed", response_model=int, operation_id="get_completed_appointments_count")
+async def get_completed_appointments_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "STAFF"])
 ):
     """Get count of completed appointments"""
-    return get_appointments_count_by_status(db, AppointmentStatus.COMPLETED)
+    return await get_appointments_count_by_status(db, AppointmentStatus.COMPLETED)
 
 # Facility endpoint
-@router.get("/facility/{facility_id}", operation_id="get_facility_appointments")
-def get_facility_appointments(
+@router.get("/facility/{facility_id}", response_model=AppointmentPage, operation_id="get_facility_appointments")
+async def get_facility_appointments(
     facility_id: str, 
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "STAFF"])
 ):
     """Get all appointments for a specific facility"""
-    return get_appointments_by_facility_id(db, facility_id)
+    return await get_appointments_by_facility_id(db, facility_id, limit, cursor)
 
 # Doctor status endpoint
-@router.get("/doctor/{doctor_id}/status/{status}", operation_id="get_doctor_appointments_by_status")
-def get_appointment_count_for_doctor(
+@router.get("/doctor/{doctor_id}/status/{status}", response_model=int, operation_id="get_doctor_appointments_by_status")
+async def get_appointment_count_for_doctor(
     doctor_id: str,
     status: AppointmentStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF"])
 ):
     """Get count of appointments for a doctor by status"""
@@ -175,14 +197,14 @@ def get_appointment_count_for_doctor(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Doctors can only view their own appointment counts"
         )
-    return get_appointment_count_by_doctor_and_status(db, doctor_id, status)
+    return await get_appointment_count_by_doctor_and_status(db, doctor_id, status)
 
 # Patient status endpoint
-@router.get("/patient/{patient_id}/status/{status}", operation_id="get_patient_appointments_by_status")
-def get_appointment_count_for_patient(
+@router.get("/patient/{patient_id}/status/{status}", response_model=int, operation_id="get_patient_appointments_by_status")
+async def get_appointment_count_for_patient(
     patient_id: str,
     status: AppointmentStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["ADMIN", "DOCTOR", "STAFF", "PATIENT"])
 ):
     """Get count of appointments for a patient by status"""
@@ -192,15 +214,15 @@ def get_appointment_count_for_patient(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Patients can only view their own appointment counts"
         )
-    return get_appointment_count_by_patient_and_status(db, patient_id, status)
+    return await get_appointment_count_by_patient_and_status(db, patient_id, status)
 
 # Time slots endpoint
-@router.get("/slots/available", operation_id="get_available_time_slots")
-def get_available_slots(
+@router.get("/slots/available", response_model=List[TimeSlot], operation_id="get_available_time_slots")
+async def get_available_slots(
     doctor_id: str,
     appointment_date: date = Query(..., alias="date"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get available time slots for a doctor on a specific date"""
-    return get_available_time_slots(db, doctor_id, appointment_date)
+    return await get_available_time_slots(db, doctor_id, appointment_date)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 from datetime import date, time
-from typing import Optional
+from typing import List, Optional
 from app.models.appointments import AppointmentStatus
 
 class TimeSlot(BaseModel):
@@ -74,17 +74,19 @@ class AppointmentRequest(BaseModel):
         example="Patient has reported mild fever and headache"
     )
 
-    @validator('appointment_date')
-    def validate_appointment_date(cls, v):
+    @field_validator('appointment_date')
+    @classmethod
+    def validate_appointment_date(cls, v: date) -> date:
         today = date.today()
         if v < today:
             raise ValueError("Appointment date must be in the future or present")
         return v
 
-
-    @validator('appointment_end_time')
-    def validate_appointment_time(cls, v, values):
-        if 'appointment_start_time' in values and v <= values['appointment_start_time']:
+    @field_validator('appointment_end_time')
+    @classmethod
+    def validate_appointment_time(cls, v: time, info: ValidationInfo) -> time:
+        start_time = info.data.get('appointment_start_time')
+        if start_time is not None and v <= start_time:
             raise ValueError("End time must be after start time")
         return v
 
@@ -137,6 +139,70 @@ class AppointmentResponse(AppointmentRequest):
             }
         }
 
+class AppointmentDetail(BaseModel):
+    """Full stored appointment. Read-only, so none of the request validators
+    apply (a past appointment_date is valid here)."""
+    appointment_id: str
+    doctor_id: str
+    patient_id: str
+    facility_id: str
+    doctor_name: str
+    patient_name: str
+    appointment_date: date
+    appointment_start_time: time
+    appointment_end_time: time
+    purpose_of_visit: str
+    description: Optional[str]
+    status: str
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "appointment_id": "APT0001",
+                "doctor_id": "DOC0001",
+                "patient_id": "PAT0001",
+                "facility_id": "FAC0001",
+                "doctor_name": "Dr. John Smith",
+                "patient_name": "Jane Doe",
+                "appointment_date": "2023-12-25",
+                "appointment_start_time": "09:00:00",
+                "appointment_end_time": "10:00:00",
+                "purpose_of_visit": "Regular checkup",
+                "description": "Patient has reported mild fever and headache",
+                "status": "SCHEDULED"
+            }
+        }
+
+class AppointmentListItem(BaseModel):
+    """Summary row returned by the list endpoints"""
+    appointment_id: str
+    doctor_id: str
+    patient_id: str
+    appointment_date: date
+    appointment_start_time: time
+    appointment_end_time: time
+    status: str
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "appointment_id": "APT0001",
+                "doctor_id": "DOC0001",
+                "patient_id": "PAT0001",
+                "appointment_date": "2023-12-25",
+                "appointment_start_time": "09:00:00",
+                "appointment_end_time": "10:00:00",
+                "status": "SCHEDULED"
+            }
+        }
+
+class AppointmentPage(BaseModel):
+    """A page of list results; pass next_cursor back as ?cursor= for the next page"""
+    items: List[AppointmentListItem]
+    next_cursor: Optional[str] = None
+
 class AppointmentStatusUpdateRequest(BaseModel):
     status: AppointmentStatus = Field(
         ..., 